@@ -0,0 +1,69 @@
+import hashlib
+from typing import Any, Callable
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from redis import asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+from starlette.responses import Response
+
+from config import settings
+
+POSTS_NAMESPACE = "posts"
+USERS_NAMESPACE = "users"
+
+
+## request_key_builder
+def request_key_builder(
+    func: Callable[..., Any],
+    namespace: str = "",
+    *,
+    request: Request | None = None,
+    response: Response | None = None,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> str:
+    """Build a cache key from the request path and query string.
+
+    The default builder hashes the handler kwargs, which include the
+    per-request database session and would never produce a hit. Direct
+    calls without a request fall back to hashing the remaining arguments.
+    """
+    if request is None:
+        params = {
+            name: value
+            for name, value in kwargs.items()
+            if not isinstance(value, AsyncSession)
+        }
+        digest = hashlib.md5(f"{args}:{sorted(params.items())}".encode()).hexdigest()
+        return f"{namespace}:{func.__module__}:{func.__name__}:{digest}"
+    query = sorted(request.query_params.multi_items())
+    return f"{namespace}:{request.url.path}?{query}"
+
+
+def init_cache() -> None:
+    """Use Redis when REDIS_URL is configured, otherwise a per-process cache.
+
+    The in-memory fallback is only safe with a single worker: invalidation
+    clears the cache of the worker that handled the write, and the others
+    keep serving stale entries until they expire.
+    """
+    if settings.redis_url:
+        redis = aioredis.from_url(settings.redis_url)
+        backend = RedisBackend(redis)
+    else:
+        backend = InMemoryBackend()
+    FastAPICache.init(backend, prefix="fc", key_builder=request_key_builder)
+
+
+## invalidation helpers
+async def invalidate_posts() -> None:
+    await FastAPICache.clear(namespace=POSTS_NAMESPACE)
+
+
+async def invalidate_users() -> None:
+    # Post responses embed the author, so user changes stale both namespaces
+    await FastAPICache.clear(namespace=USERS_NAMESPACE)
+    await FastAPICache.clear(namespace=POSTS_NAMESPACE)
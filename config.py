@@ -15,5 +15,21 @@ class Settings(BaseSettings):
 
     posts_per_page: int = 10
 
+    templates_auto_reload: bool = False
+
+    db_pool_size: int = 20
+    db_max_overflow: int = 40
+    # Set DB_CREATE_ALL=false to skip schema creation on worker startup and
+    # run `python create_schema.py` once at deploy time instead
+    db_create_all: bool = True
+
+    # Required when running more than one worker. Without it each worker keeps
+    # its own in-memory cache, and a write only invalidates the cache of the
+    # worker that handled it; the others serve stale posts and users until
+    # the TTLs below expire
+    redis_url: str | None = None
+    posts_cache_expire_seconds: int = 30
+    users_cache_expire_seconds: int = 300
+
 
 settings = Settings()  # type: ignore # Loaded from .env file
@@ -0,0 +1,13 @@
+import asyncio
+
+import models  # noqa: F401 # Registers the tables on Base.metadata
+from database import create_schema, engine
+
+
+async def main() -> None:
+    await create_schema()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
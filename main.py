@@ -7,16 +7,19 @@ from fastapi.exception_handlers import (
     request_validation_exception_handler,
 )
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import HTMLResponse, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from sqlalchemy import select, func
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 import models
-from database import Base, engine, get_db
+from caching import init_cache
+from database import create_schema, engine, get_db
+from queries import fetch_posts_page
 from routers import posts, users
 from config import settings
 
@@ -24,20 +27,35 @@ from config import settings
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncGenerator:
     # startup
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Multi-worker deployments can disable this and create the schema once
+    # at deploy time instead of every worker inspecting tables on boot
+    if settings.db_create_all:
+        await create_schema()
+    init_cache()
     yield
 
     # shutdown
     await engine.dispose()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+# Feeds and HTML pages are highly compressible; tiny bodies aren't worth it
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
 app.mount("/media", StaticFiles(directory="media"), name="media")
 
-templates = Jinja2Templates(directory="templates")
+# Compiled templates are cached on disk across restarts, and without
+# auto_reload renders skip the per-request mtime check on template files
+templates = Jinja2Templates(
+    env=Environment(
+        loader=FileSystemLoader("templates"),
+        autoescape=True,
+        bytecode_cache=FileSystemBytecodeCache(),
+        auto_reload=settings.templates_auto_reload,
+    ),
+)
 
 # Include routes
 app.include_router(users.router)
@@ -48,18 +66,11 @@ app.include_router(posts.router)
 @app.get("/", include_in_schema=False, name="home")
 @app.get("/posts", include_in_schema=False, name="posts")
 async def home(request: Request, db: Annotated[AsyncSession, Depends(get_db)]):
-    count_result = await db.execute(select(func.count()).select_from(models.Post))
-    total = count_result.scalar() or 0
-
-    result = await db.execute(
-        select(models.Post)
-        .options(selectinload(models.Post.author))
-        .order_by(models.Post.date_posted.desc())
-        .limit(settings.posts_per_page),
-    )
-    posts = result.scalars().all()
+    # One extra row tells whether there is a next page, no COUNT needed
+    posts = await fetch_posts_page(db, skip=0, limit=settings.posts_per_page + 1)
 
-    has_more = len(posts) < total
+    has_more = len(posts) > settings.posts_per_page
+    posts = posts[: settings.posts_per_page]
 
     return templates.TemplateResponse(
         request,
@@ -78,12 +89,7 @@ async def home(request: Request, db: Annotated[AsyncSession, Depends(get_db)]):
 async def post_page(
     request: Request, post_id: int, db: Annotated[AsyncSession, Depends(get_db)]
 ) -> HTMLResponse:
-    result = await db.execute(
-        select(models.Post)
-        .options(selectinload(models.Post.author))
-        .where(models.Post.id == post_id)
-    )
-    post = result.scalars().first()
+    post = await db.get(models.Post, post_id, options=[joinedload(models.Post.author)])
     if post:
         title = post.title[:50]
         return templates.TemplateResponse(
@@ -101,31 +107,19 @@ async def user_posts_page(
     user_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
-    result = await db.execute(select(models.User).where(models.User.id == user_id))
-    user = result.scalars().first()
+    user = await db.get(models.User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
 
-    count_result = await db.execute(
-        select(func.count())
-        .select_from(models.Post)
-        .where(models.Post.user_id == user_id),
+    posts = await fetch_posts_page(
+        db, skip=0, limit=settings.posts_per_page + 1, user_id=user_id
     )
-    total = count_result.scalar() or 0
-
-    result = await db.execute(
-        select(models.Post)
-        .options(selectinload(models.Post.author))
-        .where(models.Post.user_id == user_id)
-        .order_by(models.Post.date_posted.desc())
-        .limit(settings.posts_per_page),
-    )
-    posts = result.scalars().all()
 
-    has_more = len(posts) < total
+    has_more = len(posts) > settings.posts_per_page
+    posts = posts[: settings.posts_per_page]
 
     return templates.TemplateResponse(
         request,
@@ -168,12 +162,18 @@ async def account_page(request: Request) -> HTMLResponse:
     )
 
 
+def _is_api_request(request: Request) -> bool:
+    # Read the raw scope path rather than building a URL object
+    path = request.scope["path"]
+    return path == "/api" or path.startswith("/api/")
+
+
 ### StarletteHTTPException Handler
 @app.exception_handler(StarletteHTTPException)
 async def general_http_exception_handler(
     request: Request, exception: StarletteHTTPException
 ) -> HTMLResponse | Response:
-    if request.url.path.startswith("/api"):
+    if _is_api_request(request):
         return await http_exception_handler(request, exception)
 
     message = (
@@ -199,7 +199,7 @@ async def general_http_exception_handler(
 async def validation_exception_handler(
     request: Request, exception: RequestValidationError
 ) -> HTMLResponse | Response:
-    if request.url.path.startswith("/api"):
+    if _is_api_request(request):
         return await request_validation_exception_handler(request, exception)
     return templates.TemplateResponse(
         request,
@@ -2,12 +2,18 @@ from __future__ import annotations
 
 from datetime import UTC, datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from database import Base
 
 
+def profile_image_path(image_file: str | None) -> str:
+    if image_file:
+        return f"/media/profile_pics/{image_file}"
+    return "/static/profile_pics/default.jpg"
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -27,9 +33,7 @@ class User(Base):
 
     @property
     def image_path(self) -> str:
-        if self.image_file:
-            return f"/media/profile_pics/{self.image_file}"
-        return "/static/profile_pics/default.jpg"
+        return profile_image_path(self.image_file)
 
 
 class Post(Base):
@@ -41,11 +45,19 @@ class Post(Base):
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id"),
         nullable=False,
-        index=True,
     )
     date_posted: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=lambda: datetime.now(UTC),
+        index=True,
     )
 
     author: Mapped[User] = relationship(back_populates="posts")
+
+
+# Username and email are matched case-insensitively, which the plain unique
+# indexes can't serve
+Index("ix_users_username_lower", func.lower(User.username))
+Index("ix_users_email_lower", func.lower(User.email))
+# Per-user feeds filter on user_id and order by date_posted
+Index("ix_posts_user_id_date_posted", Post.user_id, Post.date_posted)
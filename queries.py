@@ -0,0 +1,113 @@
+from sqlalchemy import RowMapping, bindparam, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import models
+from database import engine
+from schemas import PostResponse, PostResponseList, UserPublic
+
+# Statements are built once at import and parameterized per call
+
+_POST_COUNT = select(func.count()).select_from(models.Post)
+_USER_POST_COUNT = _POST_COUNT.where(models.Post.user_id == bindparam("user_id"))
+
+_POST_ROWS = select(
+    models.Post.id,
+    models.Post.title,
+    models.Post.content,
+    models.Post.user_id,
+    models.Post.date_posted,
+    models.User.username,
+    models.User.image_file,
+).join(models.Post.author)
+_POST_BY_ID = _POST_ROWS.where(models.Post.id == bindparam("post_id"))
+_FEED = (
+    _POST_ROWS.order_by(models.Post.date_posted.desc())
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+_USER_FEED = _FEED.where(models.Post.user_id == bindparam("user_id"))
+
+_USER_BY_ID = select(
+    models.User.id,
+    models.User.username,
+    models.User.image_file,
+).where(models.User.id == bindparam("user_id"))
+
+
+def _author(user_id: int, username: str, image_file: str | None) -> dict:
+    return {
+        "id": user_id,
+        "username": username,
+        "image_file": image_file,
+        "image_path": models.profile_image_path(image_file),
+    }
+
+
+def _post(row: RowMapping) -> dict:
+    return {
+        "id": row["id"],
+        "title": row["title"],
+        "content": row["content"],
+        "user_id": row["user_id"],
+        "date_posted": row["date_posted"],
+        "author": _author(row["user_id"], row["username"], row["image_file"]),
+    }
+
+
+## count_posts
+async def count_posts(db: AsyncSession, user_id: int | None = None) -> int:
+    if user_id is None:
+        result = await db.execute(_POST_COUNT)
+    else:
+        result = await db.execute(_USER_POST_COUNT, {"user_id": user_id})
+    return result.scalar() or 0
+
+
+## fetch_posts_page
+async def fetch_posts_page(
+    db: AsyncSession,
+    *,
+    skip: int,
+    limit: int,
+    user_id: int | None = None,
+) -> list[PostResponse]:
+    """Fetch a page of posts with their authors as plain rows.
+
+    Selects only the columns the feed renders, skipping ORM hydration and
+    identity-map bookkeeping for every post and author.
+    """
+    if user_id is None:
+        result = await db.execute(_FEED, {"skip": skip, "limit": limit})
+    else:
+        result = await db.execute(
+            _USER_FEED, {"skip": skip, "limit": limit, "user_id": user_id}
+        )
+
+    return PostResponseList.validate_python([_post(row) for row in result.mappings()])
+
+
+## fetch_post
+async def fetch_post(post_id: int) -> PostResponse | None:
+    """Read a post on a plain pooled connection, without an ORM session.
+
+    The connection is opened here rather than injected, so callers behind the
+    response cache only check one out on a cache miss.
+    """
+    async with engine.connect() as conn:
+        result = await conn.execute(_POST_BY_ID, {"post_id": post_id})
+        row = result.mappings().first()
+    if row is None:
+        return None
+    return PostResponse.model_validate(_post(row))
+
+
+## fetch_user
+async def fetch_user(user_id: int) -> UserPublic | None:
+    async with engine.connect() as conn:
+        result = await conn.execute(_USER_BY_ID, {"user_id": user_id})
+        row = result.mappings().first()
+    if row is None:
+        return None
+    return UserPublic.model_validate(
+        _author(row["id"], row["username"], row["image_file"])
+    )
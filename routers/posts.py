@@ -1,43 +1,64 @@
-from typing import Annotated
+from typing import Annotated, NoReturn
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy import select, func
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query
+from fastapi_cache.decorator import cache
+from sqlalchemy import bindparam, delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 import models
 from auth import CurrentUser
+from caching import POSTS_NAMESPACE, invalidate_posts
+from config import settings
 from database import get_db
-from schemas import PostCreate, PostResponse, PostUpdate, PaginatedPostsResponse
+from queries import count_posts, fetch_post, fetch_posts_page
+from schemas import (
+    PostCreate,
+    PostResponse,
+    PostResponseList,
+    PostUpdate,
+    PaginatedPostsResponse,
+)
 
 router = APIRouter(
     prefix="/api/posts",
     tags=["Posts"],
 )
 
+_POST_ID_BY_ID = select(models.Post.id).where(models.Post.id == bindparam("post_id"))
+
+
+## _raise_missing_or_forbidden
+async def _raise_missing_or_forbidden(
+    db: AsyncSession, post_id: int, forbidden_detail: str
+) -> NoReturn:
+    """Explain why an author-scoped write matched no rows."""
+    result = await db.execute(_POST_ID_BY_ID, {"post_id": post_id})
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Post not found",
+        )
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=forbidden_detail,
+    )
+
 
 ## get_posts
 @router.get("", response_model=PaginatedPostsResponse)
+@cache(expire=settings.posts_cache_expire_seconds, namespace=POSTS_NAMESPACE)
 async def get_posts(
     db: Annotated[AsyncSession, Depends(get_db)],
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=100)] = 10,
 ) -> PaginatedPostsResponse:
 
-    count_result = await db.execute(select(func.count()).select_from(models.Post))
-    total = count_result.scalar() or 0
+    total = await count_posts(db)
 
-    result = await db.execute(
-        select(models.Post)
-        .options(selectinload(models.Post.author))
-        .order_by(models.Post.date_posted.desc())
-        .offset(skip)
-        .limit(limit),
-    )
-    posts = result.scalars().all()
+    posts = await fetch_posts_page(db, skip=skip, limit=limit)
     has_more = skip + len(posts) < total
     return PaginatedPostsResponse(
-        posts=[PostResponse.model_validate(post) for post in posts],
+        posts=posts,
         total=total,
         skip=skip,
         limit=limit,
@@ -64,23 +85,40 @@ async def create_post(
     )
     db.add(new_post)
     await db.commit()
+    await invalidate_posts()
     await db.refresh(new_post, attribute_names=["author"])
     return PostResponse.model_validate(new_post)
 
 
-## get_post
-@router.get("/{post_id}", response_model=PostResponse)
-async def get_post(
-    post_id: int, db: Annotated[AsyncSession, Depends(get_db)]
-) -> PostResponse:
+## bulk_create_posts
+@router.post(
+    "/bulk",
+    response_model=list[PostResponse],
+    status_code=status.HTTP_201_CREATED,
+)
+async def bulk_create_posts(
+    posts: Annotated[list[PostCreate], Body(min_length=1, max_length=100)],
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> list[PostResponse]:
+    # A single executemany INSERT, batched into multi-row VALUES by the engine
     result = await db.execute(
-        select(models.Post)
-        .options(selectinload(models.Post.author))
-        .where(models.Post.id == post_id),
+        insert(models.Post).returning(models.Post),
+        [{**post.model_dump(), "user_id": current_user.id} for post in posts],
     )
-    post = result.scalars().first()
+    new_posts = result.scalars().all()
+    await db.commit()
+    await invalidate_posts()
+    return PostResponseList.validate_python(new_posts, from_attributes=True)
+
+
+## get_post
+@router.get("/{post_id}", response_model=PostResponse)
+@cache(expire=settings.posts_cache_expire_seconds, namespace=POSTS_NAMESPACE)
+async def get_post(post_id: int) -> PostResponse:
+    post = await fetch_post(post_id)
     if post:
-        return PostResponse.model_validate(post)
+        return post
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
 
 
@@ -92,23 +130,24 @@ async def update_post_full(
     current_user: CurrentUser,
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> PostResponse:
-    result = await db.execute(select(models.Post).where(models.Post.id == post_id))
-    post = result.scalars().first()
-    if not post:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Post not found",
+    result = await db.execute(
+        update(models.Post)
+        .where(
+            models.Post.id == post_id,
+            models.Post.user_id == current_user.id,
         )
-    if post.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this Post",
+        .values(title=post_data.title, content=post_data.content)
+        .returning(models.Post),
+    )
+    post = result.scalar_one_or_none()
+    if post is None:
+        await _raise_missing_or_forbidden(
+            db, post_id, "Not authorized to update this Post"
         )
-    post.title = post_data.title
-    post.content = post_data.content
 
     await db.commit()
-    await db.refresh(post, attribute_names=["author"])
+    await invalidate_posts()
+    # author is current_user, already in the identity map, so no extra query
     return PostResponse.model_validate(post)
 
 
@@ -120,26 +159,30 @@ async def update_post_partial(
     current_user: CurrentUser,
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> PostResponse:
-    result = await db.execute(select(models.Post).where(models.Post.id == post_id))
-    post = result.scalars().first()
-    if not post:
+    update_data = post_data.model_dump(exclude_unset=True)
+    if not update_data:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Post not found",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields to update",
         )
 
-    if post.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to update this Post",
+    result = await db.execute(
+        update(models.Post)
+        .where(
+            models.Post.id == post_id,
+            models.Post.user_id == current_user.id,
+        )
+        .values(**update_data)
+        .returning(models.Post),
+    )
+    post = result.scalar_one_or_none()
+    if post is None:
+        await _raise_missing_or_forbidden(
+            db, post_id, "Not authorized to update this Post"
         )
-
-    update_data = post_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(post, field, value)
 
     await db.commit()
-    await db.refresh(post, attribute_names=["author"])
+    await invalidate_posts()
     return PostResponse.model_validate(post)
 
 
@@ -150,19 +193,16 @@ async def delete_post(
     current_user: CurrentUser,
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> None:
-    result = await db.execute(select(models.Post).where(models.Post.id == post_id))
-    post = result.scalars().first()
-    if not post:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Post not found",
-        )
-
-    if post.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not authorized to delete this Post",
+    result = await db.execute(
+        delete(models.Post).where(
+            models.Post.id == post_id,
+            models.Post.user_id == current_user.id,
+        ),
+    )
+    if result.rowcount == 0:
+        await _raise_missing_or_forbidden(
+            db, post_id, "Not authorized to delete this Post"
         )
 
-    await db.delete(post)
     await db.commit()
+    await invalidate_posts()
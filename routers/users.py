@@ -3,10 +3,10 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, status, Query
 from fastapi.security import OAuth2PasswordRequestForm
+from fastapi_cache.decorator import cache
 from PIL import UnidentifiedImageError
-from sqlalchemy import func, select
+from sqlalchemy import bindparam, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 from starlette.concurrency import run_in_threadpool
 
 import models
@@ -16,11 +16,16 @@ from auth import (
     hash_password,
     verify_password,
 )
+from caching import (
+    POSTS_NAMESPACE,
+    USERS_NAMESPACE,
+    invalidate_users,
+)
 from config import settings
 from database import get_db
+from queries import count_posts, fetch_posts_page, fetch_user
 from image_utils import delete_profile_image, process_profile_image
 from schemas import (
-    PostResponse,
     Token,
     UserCreate,
     UserPrivate,
@@ -34,6 +39,43 @@ router = APIRouter(
     tags=["Users"],
 )
 
+_USER_ID_BY_ID = select(models.User.id).where(models.User.id == bindparam("user_id"))
+_USER_BY_EMAIL = select(models.User).where(
+    func.lower(models.User.email) == bindparam("email"),
+)
+_USERS_BY_USERNAME_OR_EMAIL = select(models.User.username, models.User.email).where(
+    or_(
+        func.lower(models.User.username) == bindparam("username"),
+        func.lower(models.User.email) == bindparam("email"),
+    ),
+)
+
+
+## _find_conflict
+async def _find_conflict(
+    db: AsyncSession, username: str | None = None, email: str | None = None
+) -> str | None:
+    """Check username and email uniqueness in one query; return the error detail."""
+    if username is None and email is None:
+        return None
+
+    # A NULL parameter compares as unknown, so an omitted field never matches
+    result = await db.execute(
+        _USERS_BY_USERNAME_OR_EMAIL,
+        {
+            "username": username.lower() if username is not None else None,
+            "email": email.lower() if email is not None else None,
+        },
+    )
+    rows = result.all()
+    if username is not None and any(
+        row.username.lower() == username.lower() for row in rows
+    ):
+        return "Username already exists"
+    if rows:
+        return "Email already registered"
+    return None
+
 
 ## create_user
 @router.post(
@@ -44,32 +86,17 @@ router = APIRouter(
 async def create_user(
     user: UserCreate, db: Annotated[AsyncSession, Depends(get_db)]
 ) -> UserPrivate:
-    result = await db.execute(
-        select(models.User).where(
-            func.lower(models.User.username) == user.username.lower()
-        ),
-    )
-    existing_user = result.scalars().first()
-    if existing_user:
+    conflict = await _find_conflict(db, username=user.username, email=user.email)
+    if conflict:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already exists",
-        )
-
-    result = await db.execute(
-        select(models.User).where(func.lower(models.User.email) == user.email.lower()),
-    )
-    existing_email = result.scalars().first()
-    if existing_email:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
+            detail=conflict,
         )
 
     new_user = models.User(
         username=user.username,
         email=user.email.lower(),
-        password_hashed=hash_password(user.password),
+        password_hashed=await run_in_threadpool(hash_password, user.password),
     )
     db.add(new_user)
     await db.commit()
@@ -85,16 +112,15 @@ async def login_for_access_token(
 ) -> Token:
     # Look up user by email (case-insensitive)
     # Note: OAuth2PasswordRequestForm uses "username" field, but we treat it as email
-    result = await db.execute(
-        select(models.User).where(
-            func.lower(models.User.email) == form_data.username.lower(),
-        ),
-    )
+    result = await db.execute(_USER_BY_EMAIL, {"email": form_data.username.lower()})
     user = result.scalars().first()
 
     # Verify user exists and password is correct
     # Don't reveal which one failed (security best practice)
-    if not user or not verify_password(form_data.password, user.password_hashed):
+    # Argon2 is CPU-bound, so keep it off the event loop
+    if not user or not await run_in_threadpool(
+        verify_password, form_data.password, user.password_hashed
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -119,53 +145,38 @@ async def get_current_user(current_user: CurrentUser) -> UserPrivate:
 
 ## get_user
 @router.get("/{user_id}", response_model=UserPublic)
-async def get_user(
-    user_id: int, db: Annotated[AsyncSession, Depends(get_db)]
-) -> UserPublic:
-    result = await db.execute(select(models.User).where(models.User.id == user_id))
-    user = result.scalars().first()
+@cache(expire=settings.users_cache_expire_seconds, namespace=USERS_NAMESPACE)
+async def get_user(user_id: int) -> UserPublic:
+    user = await fetch_user(user_id)
     if user:
-        return UserPublic.model_validate(user)
+        return user
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
 
 ## get_user_posts - paginated
 @router.get("/{user_id}/posts", response_model=PaginatedPostsResponse)
+@cache(expire=settings.posts_cache_expire_seconds, namespace=POSTS_NAMESPACE)
 async def get_user_posts(
     user_id: int,
     db: Annotated[AsyncSession, Depends(get_db)],
     skip: Annotated[int, Query(ge=0)] = 0,
     limit: Annotated[int, Query(ge=1, le=100)] = 10,
 ):
-    result = await db.execute(select(models.User).where(models.User.id == user_id))
-    user = result.scalars().first()
-    if not user:
+    result = await db.execute(_USER_ID_BY_ID, {"user_id": user_id})
+    if result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
 
-    count_result = await db.execute(
-        select(func.count())
-        .select_from(models.Post)
-        .where(models.Post.user_id == user_id),
-    )
-    total = count_result.scalar() or 0
+    total = await count_posts(db, user_id=user_id)
 
-    result = await db.execute(
-        select(models.Post)
-        .options(selectinload(models.Post.author))
-        .where(models.Post.user_id == user_id)
-        .order_by(models.Post.date_posted.desc())
-        .offset(skip)
-        .limit(limit),
-    )
-    posts = result.scalars().all()
+    posts = await fetch_posts_page(db, skip=skip, limit=limit, user_id=user_id)
 
     has_more = skip + len(posts) < total
 
     return PaginatedPostsResponse(
-        posts=[PostResponse.model_validate(post) for post in posts],
+        posts=posts,
         total=total,
         skip=skip,
         limit=limit,
@@ -188,43 +199,30 @@ async def update_user(
             detail="Not authorized to update this User",
         )
 
-    result = await db.execute(select(models.User).where(models.User.id == user_id))
-    user = result.scalars().first()
+    user = await db.get(models.User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-    if (
-        user_update.username is not None
+    new_username = (
+        user_update.username
+        if user_update.username is not None
         and user_update.username.lower() != user.username.lower()
-    ):
-        result = await db.execute(
-            select(models.User).where(
-                func.lower(models.User.username) == user_update.username.lower()
-            ),
-        )
-        existing_user = result.scalars().first()
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already exists",
-            )
-    if (
-        user_update.email is not None
+        else None
+    )
+    new_email = (
+        user_update.email
+        if user_update.email is not None
         and user_update.email.lower() != user.email.lower()
-    ):
-        result = await db.execute(
-            select(models.User).where(
-                func.lower(models.User.email) == user_update.email.lower()
-            ),
+        else None
+    )
+    conflict = await _find_conflict(db, username=new_username, email=new_email)
+    if conflict:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=conflict,
         )
-        existing_email = result.scalars().first()
-        if existing_email:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered",
-            )
 
     if user_update.username is not None:
         user.username = user_update.username
@@ -232,6 +230,7 @@ async def update_user(
         user.email = user_update.email.lower()
 
     await db.commit()
+    await invalidate_users()
     await db.refresh(user)
     return UserPublic.model_validate(user)
 
@@ -250,17 +249,12 @@ async def delete_user(
             detail="Not authorized to delete this Post",
         )
 
-    result = await db.execute(select(models.User).where(models.User.id == user_id))
-    user = result.scalars().first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-    old_filename = user.image_file
+    # current_user is already loaded in this session, no need to fetch it again
+    old_filename = current_user.image_file
 
-    await db.delete(user)
+    await db.delete(current_user)
     await db.commit()
+    await invalidate_users()
 
     if old_filename:
         delete_profile_image(old_filename)
@@ -300,6 +294,7 @@ async def upload_profile_picture(
 
     current_user.image_file = new_filename
     await db.commit()
+    await invalidate_users()
     await db.refresh(current_user)
 
     if old_filename:
@@ -331,6 +326,7 @@ async def delete_user_picture(
 
     current_user.image_file = None
     await db.commit()
+    await invalidate_users()
     await db.refresh(current_user)
 
     delete_profile_image(old_filename)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, TypeAdapter
 
 
 class UserBase(BaseModel):
@@ -58,6 +58,10 @@ class PostResponse(PostBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+## Validates a whole list of ORM posts in one call instead of per item
+PostResponseList = TypeAdapter(list[PostResponse])
+
+
 ## Paginated Post Response Schema
 class PaginatedPostsResponse(BaseModel):
     posts: list[PostResponse]